@@ -0,0 +1,613 @@
+"""TMJ number extraction, kept out of the Streamlit script so worker processes can import it"""
+import re
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+import numpy as np
+import xlsxwriter
+import logging
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+import gc
+from concurrent.futures import CancelledError, Executor, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+import multiprocessing
+import os
+import tempfile
+import time
+import functools
+import hashlib
+import json
+
+try:
+    import re2  # Optional linear-time DFA engine (google-re2)
+except ImportError:
+    re2 = None
+
+try:
+    import pymupdf  # C-based text extraction, preferred over pdfplumber
+except ImportError:
+    pymupdf = None
+
+try:
+    import pypdfium2  # PDFium text extraction, used when PyMuPDF is unavailable
+except ImportError:
+    pypdfium2 = None
+
+# Configure logging; worker processes import this module too, so they log to the same file
+logging.basicConfig(filename="pdf_extraction.log", level=logging.INFO, 
+                   format="%(asctime)s - %(message)s")
+
+def compile_fast(pattern: str):
+    """Compile with RE2 when installed, falling back to `re` for unsupported syntax"""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+# Original section markers as compiled regex
+SECTION_MARKERS = {
+    'corrigenda': re.compile(r'CORRIGENDA', re.IGNORECASE),
+    'renewal': re.compile(r'FOLLOWING TRADE MARKS REGISTRATION RENEWED', re.IGNORECASE),
+    'registered': re.compile(r'FOLLOWING TRADE MARK APPLICATIONS HAVE BEEN REGISTERED', re.IGNORECASE),
+    'pr_section': re.compile(r'PR SECTION', re.IGNORECASE)
+}
+
+# All section markers located in a single scan of the page
+MARKER_SOURCE = '(?i)' + '|'.join(f'(?P<{k}>{p.pattern})' for k, p in SECTION_MARKERS.items())
+
+# Original patterns fused into one alternation, dispatched on lastgroup.
+# Lines are never crossed ([^\S\n]) so matches stay line-local.
+MASTER_SOURCE = (
+    r'(?m)(?P<rc>^[^\S\n]*\d+(?:[^\S\n]+\d+){4}[^\S\n]*$)'
+    r'|(?P<pr_section>(\d{5,})[^\S\n]*-)'
+    r'|(?P<word>\b(\d{5,})\b)'
+    r'|(?P<number>(\d{5,}))'
+)
+
+# (markers, master) pairs. RE2's \d, \s and \b are ASCII-only, so it only scans
+# ASCII pages; any other page keeps the original Unicode semantics of `re`
+# (NBSP and other Unicode spaces, non-Latin letters at word boundaries).
+ASCII_PATTERNS = (compile_fast(MARKER_SOURCE), compile_fast(MASTER_SOURCE))
+UNICODE_PATTERNS = (re.compile(MARKER_SOURCE), re.compile(MASTER_SOURCE))
+
+# Literal every match of a category must contain; segments without it skip that category
+REQUIRED_LITERALS = {'advertisement': '/', 'pr_section': '-'}
+WORD_CHAR = re.compile(r'\w')
+# Date after an advertisement number; checked separately so the date's digits
+# stay available to the other categories
+ADVERTISEMENT_DATE = re.compile(r'[^\S\n]+\d{2}/\d{2}/\d{4}')
+APPLICATION_NO = re.compile(r'Application No[^\S\n]+$')
+ANY_DIGIT = re.compile(r'\d')  # Every category needs at least one digit
+CACHE_VERSION = 2  # Bump when extraction rules change to invalidate cached results
+TEXT_OPERATOR = re.compile(rb'T[jJ]|[\'"]')  # Tj, TJ, ' and " paint text
+
+class TMJNumberExtractor:
+    """Enhanced extractor with all original logic plus optimizations"""
+    
+    def __init__(self):
+        # Categories reported for every page, in display order
+        self.categories = ('advertisement', 'corrigenda', 'rc', 'renewal', 'pr_section')
+        
+        # Original validation rules
+        self.min_number_length = 5
+        self.max_number_length = None
+        
+        # Optimization parameters
+        self.batch_size = 3  # Reduced for better memory handling
+        self.timeout_seconds = 30  # Timeout per batch of batch_size pages, scaled for larger batches
+        self.max_batch_size = 32  # Bounds the pages lost when one batch times out
+        self.progress_interval = 0.25  # Minimum seconds between progress updates
+        # One worker process per core this process may run on, capped to bound memory
+        usable_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        self.max_workers = min(usable_cpus, 8)
+        self.min_process_pages = 4  # Smaller PDFs stay in-process; spawning workers costs more
+        self.cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "tmj")  # Results by PDF hash
+        self.cache_max_entries = 256  # Least recently used entries beyond this are evicted
+        self.cache_max_age = 30 * 24 * 3600  # Seconds since last use before an entry is evicted
+        self.logger = logging.getLogger(__name__)
+
+    def _has_valid_length(self, number: str) -> bool:
+        """Length rules only, for regex captures that are all digits already"""
+        return (len(number) >= self.min_number_length and
+                (self.max_number_length is None or len(number) <= self.max_number_length))
+
+    @staticmethod
+    def _patterns(data: str) -> Tuple[re.Pattern, re.Pattern]:
+        """(markers, master) patterns for a page; str.isascii() is a flag check"""
+        return ASCII_PATTERNS if data.isascii() else UNICODE_PATTERNS
+
+    def _marker_lines(self, data: str) -> Dict[str, List[Tuple[int, int]]]:
+        """(start, end) offsets of every line holding a section marker"""
+        lines = {k: [] for k in SECTION_MARKERS}
+        for m in self._patterns(data)[0].finditer(data):
+            start = data.rfind('\n', 0, m.start()) + 1
+            end = data.find('\n', m.end())
+            span = (start, len(data) if end == -1 else end + 1)
+            if not lines[m.lastgroup] or lines[m.lastgroup][-1] != span:
+                lines[m.lastgroup].append(span)
+        return lines
+
+    @staticmethod
+    def _spans_after(lines: List[Tuple[int, int]], end: int) -> List[Tuple[int, int]]:
+        """Text after the first marker line up to `end`, skipping later marker lines"""
+        if not lines or lines[0][0] >= end:
+            return []
+        spans, pos = [], lines[0][1]
+        for start, stop in lines[1:]:
+            if start >= end:
+                break
+            if pos < start:
+                spans.append((pos, start))
+            pos = stop
+        if pos < end:
+            spans.append((pos, end))
+        return spans
+
+    def _section_spans(self, data: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Section brackets of the original line-by-line processors as offsets"""
+        lines = self._marker_lines(data)
+        corrigenda = lines['corrigenda']
+        registered = [s for s in lines['registered'] if s not in corrigenda]
+        return {
+            'advertisement': [(0, corrigenda[0][0] if corrigenda else len(data))],
+            'corrigenda': self._spans_after(corrigenda, registered[0][0] if registered else len(data)),
+            'rc': [(0, lines['renewal'][0][0] if lines['renewal'] else len(data))],
+            'renewal': self._spans_after(lines['renewal'], len(data)),
+            'pr_section': self._spans_after(lines['pr_section'], len(data))
+        }
+
+    def _is_renewal_number(self, data: str, start: int, kind: str) -> bool:
+        """Original renewal patterns for matches not already classified as \\b-bounded"""
+        if kind == 'word':
+            return True
+        if kind == 'number':
+            # Not word-bounded: only the 'Application No' pattern can still take it
+            return bool(APPLICATION_NO.search(data, data.rfind('\n', 0, start) + 1, start))
+        # Dashed: the digits are bounded on the right already
+        return start == 0 or not WORD_CHAR.match(data, start - 1)
+
+    def _scan_segment(self, data: str, start: int, end: int,
+                      live: Set[str]) -> Iterator[Tuple[str, str]]:
+        """Run the master pattern once over a segment, yielding (category, number)"""
+        advertisement_resume = start  # The original pattern consumed each matched date
+        for m in self._patterns(data)[1].finditer(data, start, end):
+            if m.lastgroup == 'rc':
+                columns = m.group().split()
+                if 'rc' in live:
+                    for column in columns:
+                        yield 'rc', column
+                for category in live & {'corrigenda', 'renewal'}:
+                    for column in columns:
+                        if self._has_valid_length(column):
+                            yield category, column
+                continue
+
+            group = m.lastindex + 1
+            if 'advertisement' in live:
+                # Digits glued to a consumed year start a fresh candidate after it
+                number_start, number_end = max(m.start(group), advertisement_resume), m.end(group)
+                date = ADVERTISEMENT_DATE.match(data, number_end, end)
+                if date and number_end - number_start >= 5:  # (\d{5,}) of the original
+                    advertisement_resume = date.end()
+                    number = data[number_start:number_end]
+                    if self._has_valid_length(number):
+                        yield 'advertisement', number
+
+            number = m.group(group)
+            if not self._has_valid_length(number):
+                continue
+            if m.lastgroup in live:
+                yield m.lastgroup, number
+            if 'corrigenda' in live:
+                yield 'corrigenda', number
+            if 'renewal' in live and self._is_renewal_number(data, m.start(group), m.lastgroup):
+                yield 'renewal', number
+
+    def iter_numbers(self, text: str) -> Iterator[Tuple[str, str]]:
+        """All section processors fused into a single pass over the page text.
+
+        Numbers are yielded raw as (category, number); duplicates are removed
+        by the consumer.
+        """
+        if not text or not isinstance(text, str):
+            return
+        if not ANY_DIGIT.search(text):  # Cheap guard before locating sections
+            return
+        spans = self._section_spans(text)
+        bounds = sorted({b for s in spans.values() for span in s for b in span})
+        for start, end in zip(bounds, bounds[1:]):
+            live = {k for k, s in spans.items() if any(a <= start and end <= b for a, b in s)
+                    and (k not in REQUIRED_LITERALS or text.find(REQUIRED_LITERALS[k], start, end) != -1)}
+            if live:
+                yield from self._scan_segment(text, start, end, live)
+
+    def _has_text_operators(self, page) -> bool:
+        """Cheap check on the raw content streams before layout-aware extraction"""
+        try:
+            resources = resolve1(page.page_obj.resources) or {}
+            xobjects = resolve1(resources.get('XObject')) or {}
+            if any(getattr(resolve1(x).get('Subtype'), 'name', None) == 'Form' for x in xobjects.values()):
+                return True  # Form XObjects can carry their own text
+            return any(TEXT_OPERATOR.search(resolve1(c).get_data())
+                       for c in page.page_obj.contents)
+        except Exception:
+            return True  # Unreadable stream: let extract_text decide
+
+    @staticmethod
+    def _join_lines(words: Iterator[Tuple[float, float, str]], y_tolerance: float = 3) -> str:
+        """(x0, top, text) words regrouped into lines the way pdfplumber's extract_text does"""
+        lines, line, last_top = [], [], None
+        for word in sorted(words, key=lambda w: w[1]):
+            if last_top is not None and word[1] - last_top > y_tolerance:
+                lines.append(line)
+                line = []
+            line.append(word)
+            last_top = word[1]
+        if line:
+            lines.append(line)
+        return '\n'.join(' '.join(w[2] for w in sorted(l, key=lambda w: w[0])) for l in lines)
+
+    @staticmethod
+    def _pymupdf_text(page) -> str:
+        """PyMuPDF words in visual line order"""
+        return TMJNumberExtractor._join_lines((w[0], w[1], w[4]) for w in page.get_text("words"))
+
+    @staticmethod
+    def _pdfium_text(page) -> str:
+        """PDFium characters regrouped into words, then lines, by position.
+
+        get_text_bounded() follows content-stream order, which splits a number
+        from a date drawn in a later column; positions restore visual order.
+        """
+        textpage = page.get_textpage()
+        try:
+            words, word, x0, top = [], [], 0.0, 0.0
+            # Read each character by its own index so it always matches its box;
+            # get_text_range() may add or drop characters relative to the indices
+            for i in range(textpage.count_chars()):
+                char = chr(pypdfium2.raw.FPDFText_GetUnicode(textpage.raw, i))
+                if char.isspace() or not char.isprintable():  # Generated breaks, markers like U+FFFE
+                    if word:
+                        words.append((x0, top, ''.join(word)))
+                        word = []
+                    continue
+                if not word:
+                    x0, _, _, top = textpage.get_charbox(i, loose=True)
+                word.append(char)
+            if word:
+                words.append((x0, top, ''.join(word)))
+        finally:
+            textpage.close()
+        height = page.get_height()  # PDF y grows upwards; lines are grouped top-down
+        return TMJNumberExtractor._join_lines((x, height - y, text) for x, y, text in words)
+
+    def page_text(self, page) -> str:
+        """Text of a PyMuPDF, PDFium or pdfplumber page"""
+        if pymupdf is not None and isinstance(page, pymupdf.Page):
+            return self._pymupdf_text(page)
+        if pypdfium2 is not None and isinstance(page, pypdfium2.PdfPage):
+            return self._pdfium_text(page)
+        if not self._has_text_operators(page):
+            return ""
+        return page.extract_text() or ""
+
+    def _pdfplumber_page_text(self, pdf_path: str, index: int) -> str:
+        """Text of one page through pdfplumber, the fallback when a C backend fails"""
+        with pdfplumber.open(pdf_path, pages=[index + 1]) as pdf:
+            return self.page_text(pdf.pages[0])
+
+    def process_page(self, page, results: Dict[str, Set[str]],
+                     fallback: Optional[Callable[[], str]] = None) -> bool:
+        """Process single page with error handling, adding its numbers to `results`.
+
+        `fallback` supplies the page text when the page's own backend raises,
+        or when `page` is None because the backend could not load it.
+        Returns False when the page could not be read at all.
+        """
+        try:
+            if page is None:
+                text = fallback()
+            else:
+                try:
+                    text = self.page_text(page)
+                except Exception as e:
+                    if fallback is None:
+                        raise
+                    self.logger.warning(f"Text backend failed, retrying page with pdfplumber: {str(e)}")
+                    text = fallback()
+            for key, number in self.iter_numbers(text):
+                results[key].add(number)
+            return True
+        except Exception as e:
+            self.logger.error(f"Page processing error: {str(e)}")
+            return False
+
+    def _write_temp_pdf(self, pdf_bytes: Union[bytes, memoryview]) -> str:
+        """Materialize the upload once so every worker can open it by path"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as f:
+            f.write(pdf_bytes)
+            return f.name
+
+    def _count_pages(self, pdf_path: str) -> int:
+        """Page count from whichever backend will extract the text"""
+        if pymupdf is not None:
+            with pymupdf.open(pdf_path) as doc:
+                return doc.page_count
+        if pypdfium2 is not None:
+            doc = pypdfium2.PdfDocument(pdf_path)
+            try:
+                return len(doc)
+            finally:
+                doc.close()
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def _load_page(self, load: Callable, index: int):
+        """One page from its backend, or None (logged) when it cannot be loaded"""
+        try:
+            return load(index)
+        except Exception as e:
+            self.logger.error(f"Could not load page {index + 1}: {str(e)}")
+            return None
+
+    def _iter_pages(self, pdf_path: str, start: int, stop: int) -> Iterator[Tuple[int, object]]:
+        """(index, page) for pages [start, stop) from a private handle on the PDF; page is None if unloadable"""
+        if pymupdf is not None:
+            with pymupdf.open(pdf_path) as doc:
+                for i in range(start, min(stop, doc.page_count)):
+                    yield i, self._load_page(doc.load_page, i)
+            return
+        if pypdfium2 is not None:
+            doc = pypdfium2.PdfDocument(pdf_path)
+            try:
+                for i in range(start, min(stop, len(doc))):
+                    page = self._load_page(doc.get_page, i)
+                    yield i, page
+                    if page is not None:
+                        page.close()
+            finally:
+                doc.close()
+            return
+        # The stream is ours: pdf.close() walks pdf.pages again, which re-raises after a failed load
+        with open(pdf_path, 'rb') as stream:
+            pdf = pdfplumber.open(stream, pages=list(range(start + 1, stop + 1)))
+            try:
+                pages = pdf.pages
+            except Exception as e:
+                self.logger.warning(f"Could not load pages {start + 1}-{stop}, retrying one at a time: {str(e)}")
+                pages = None
+            if pages is not None:
+                for page in pages:
+                    yield page.page_number - 1, page
+                    page.close()  # Release the page's layout cache
+                pdf.close()
+                return
+        # pdfminer builds the whole range at once; load pages singly to isolate the bad one
+        for i in range(start, stop):
+            with open(pdf_path, 'rb') as stream:
+                pdf = pdfplumber.open(stream, pages=[i + 1])
+                try:
+                    pages = pdf.pages
+                except Exception as e:
+                    self.logger.error(f"Could not load page {i + 1}: {str(e)}")
+                    yield i, None
+                    continue
+                if not pages:  # Past the last page
+                    return
+                yield i, pages[0]
+                pdf.close()
+
+    def _process_page_range(self, pdf_path: str, start: int, stop: int) -> Tuple[Dict[str, Set[str]], int]:
+        """Process pages [start, stop), merged into one set per category, plus the unreadable page count"""
+        batch_results = {k: set() for k in self.categories}
+        failed_pages = 0
+        can_fall_back = pymupdf is not None or pypdfium2 is not None  # C backend in use
+        for index, page in self._iter_pages(pdf_path, start, stop):
+            fallback = functools.partial(self._pdfplumber_page_text, pdf_path, index) if can_fall_back else None
+            if page is None and fallback is None:
+                failed_pages += 1
+                continue
+            if not self.process_page(page, batch_results, fallback):
+                failed_pages += 1
+        return batch_results, failed_pages
+
+    def _batch_size(self, total_pages: int) -> int:
+        """Pages per task: about four tasks per worker, within [batch_size, max_batch_size]"""
+        return min(self.max_batch_size, max(self.batch_size, -(-total_pages // (self.max_workers * 4))))
+
+    @staticmethod
+    def _backend_name() -> str:
+        """Text backend used for this run; backends lay out text differently"""
+        if pymupdf is not None:
+            return "pymupdf"
+        if pypdfium2 is not None:
+            return "pdfium"
+        return "pdfplumber"
+
+    def _cache_path(self, pdf_digest: str) -> str:
+        """Disk cache entry for a PDF, keyed on its SHA-256, the backend and the extractor version"""
+        return os.path.join(self.cache_dir, f"{pdf_digest}-{self._backend_name()}-v{CACHE_VERSION}.json")
+
+    def _load_cached(self, cache_path: str) -> Optional[Dict[str, List[int]]]:
+        """Previously extracted results, or None on a miss or unreadable entry"""
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                results = json.load(f)
+            os.utime(cache_path)  # Mark as recently used for eviction
+            return results
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable cache entry {cache_path}: {str(e)}")
+            return None
+
+    def _store_cached(self, cache_path: str, results: Dict[str, List[int]]) -> None:
+        """Write results atomically so concurrent sessions never read a partial file"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=self.cache_dir, suffix=".tmp",
+                                             delete=False, encoding="utf-8") as f:
+                json.dump(results, f)
+            os.replace(f.name, cache_path)
+            self._evict_cached()
+        except OSError as e:
+            self.logger.warning(f"Could not write cache entry {cache_path}: {str(e)}")
+
+    def _evict_cached(self) -> None:
+        """Drop entries unused for cache_max_age, then the least recently used past cache_max_entries"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:  # Removed by a concurrent session
+                continue
+        entries.sort(reverse=True)
+        cutoff = time.time() - self.cache_max_age
+        for rank, (mtime, path) in enumerate(entries):
+            if rank >= self.cache_max_entries or mtime < cutoff:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _stop_pool(pool: Executor) -> None:
+        """Cancel queued batches and kill the worker processes, one of which is stuck.
+
+        Batches already finished keep their results; running ones fail. Threads
+        cannot be killed, so an in-process batch is only abandoned.
+        """
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.kill()
+
+    def process_pdf(self, pdf_bytes: Union[bytes, memoryview], pdf_digest: Optional[str] = None,
+                    on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, List[int]]:
+        """Optimized PDF processing with timeout and memory management.
+
+        UI-free: progress is reported as on_progress(pages_done, total_pages),
+        throttled to progress_interval, and failures propagate to the caller.
+        """
+        cache_path = self._cache_path(pdf_digest or hashlib.sha256(pdf_bytes).hexdigest())
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            return cached
+
+        results = {k: set() for k in self.categories}  # Unique numbers only
+        complete = True  # Only fully processed PDFs are cached
+        pdf_path = None
+        
+        try:
+            pdf_path = self._write_temp_pdf(pdf_bytes)
+            total_pages = self._count_pages(pdf_path)
+            if not total_pages:
+                return {k: [] for k in results}
+            
+            # Process in batches with timeout; pdfminer parsing is CPU-bound pure
+            # Python, so batches run in worker processes to get past the GIL
+            batch_size = self._batch_size(total_pages)
+            batch_timeout = self.timeout_seconds * batch_size / self.batch_size  # Same per-page budget
+            if total_pages < self.min_process_pages:
+                pool, task = ThreadPoolExecutor(max_workers=1), self._process_page_range
+            else:
+                # forkserver/spawn: forking the multi-threaded Streamlit server is unsafe
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                           mp_context=multiprocessing.get_context(start_method))
+                task = process_page_range
+            stopped = False  # Set once a timeout has stopped the pool
+            try:
+                futures = [
+                    pool.submit(task, pdf_path, i, i + batch_size)
+                    for i in range(0, total_pages, batch_size)
+                ]
+                
+                last_update = 0.0
+                for i, future in enumerate(futures):
+                    try:
+                        batch_results, failed_pages = future.result(timeout=batch_timeout)
+                        if failed_pages:
+                            self.logger.warning(f"Batch {i} lost {failed_pages} unreadable page(s)")
+                            complete = False
+                        for key in results:
+                            results[key] |= batch_results[key]
+                        
+                        # Report progress, throttled: each UI update is a websocket round-trip
+                        now = time.monotonic()
+                        if on_progress and (now - last_update >= self.progress_interval or i == len(futures) - 1):
+                            on_progress(min((i + 1) * batch_size, total_pages), total_pages)
+                            last_update = now
+                        
+                        # Memory management
+                        del batch_results
+                        if i % 5 == 0:  # Collect periodically
+                            gc.collect()
+                            
+                    except TimeoutError:
+                        self.logger.warning(f"Batch {i} timed out after {batch_timeout:.0f} seconds, "
+                                            "stopping the batches still pending")
+                        complete = False
+                        if not stopped:
+                            self._stop_pool(pool)
+                            stopped = True
+                        continue
+                    except CancelledError:  # Dropped when the pool was stopped
+                        complete = False
+                        continue
+                    except Exception as e:  # e.g. the batch could not open the PDF
+                        self.logger.error(f"Batch {i} failed: {str(e)}")
+                        complete = False
+                        continue
+            finally:
+                # Never wait on a worker stuck on a timed-out batch
+                pool.shutdown(wait=not stopped, cancel_futures=True)
+
+        except Exception as e:
+            self.logger.error(f"PDF processing failed: {str(e)}")
+            raise
+        finally:
+            if pdf_path:
+                os.unlink(pdf_path)
+        
+        final_results = {k: self._sorted_numbers(v) for k, v in results.items()}
+        if complete:
+            self._store_cached(cache_path, final_results)
+        return final_results
+
+    def _sorted_numbers(self, numbers: Set[str]) -> List[int]:
+        """Unique numeric values in ascending order, parsed and sorted once in NumPy"""
+        try:
+            return np.unique(np.fromiter(map(int, numbers), dtype=np.uint64, count=len(numbers))).tolist()
+        except OverflowError:  # Wider than 64 bits; keep Python ints
+            return sorted({int(n) for n in numbers})
+
+    def save_to_excel(self, data_dict: Dict[str, List[int]]) -> Optional[bytes]:
+        """Excel export streamed row by row in xlsxwriter's constant-memory mode"""
+        output = BytesIO()
+        try:
+            with xlsxwriter.Workbook(output, {"constant_memory": True}) as workbook:
+                header = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+                for sheet_name, numbers in data_dict.items():
+                    if numbers:
+                        worksheet = workbook.add_worksheet(sheet_name[:31])
+                        worksheet.set_column(0, 0, max(15, len(sheet_name) + 5))
+                        worksheet.write(0, 0, "Numbers", header)
+                        worksheet.write_column(1, 0, numbers)
+            output.seek(0)
+            return output.getvalue()
+        except Exception as e:
+            self.logger.error(f"Excel export failed: {str(e)}")
+            return None
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_extractor() -> TMJNumberExtractor:
+    """One default-configured extractor per worker process, built on its first batch"""
+    return TMJNumberExtractor()
+
+
+def process_page_range(pdf_path: str, start: int, stop: int) -> Tuple[Dict[str, Set[str]], int]:
+    """Pool task for pages [start, stop); module-level so workers unpickle it by reference"""
+    return _worker_extractor()._process_page_range(pdf_path, start, stop)